@@ -1,24 +1,35 @@
 # Refactored scatter plot data processing and updated plot to display individual articles stacked vertically with dynamic range slider configuration.
+import functools
 import logging
+import math
+import operator
 import os
+import re
 from datetime import datetime
 import hashlib
 
 import dash
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from dash import Input, Output, callback_context, dash_table, dcc, html, State
 from dash.exceptions import PreventUpdate
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+from utils import log_callback_trigger
+
+# Serialize figures with orjson (handles numpy arrays and datetimes natively)
+pio.json.config.default_engine = "orjson"
 
 # Simple session storage (in production, use proper session management)
 user_sessions = {}
 
-# Load data from CSV files
+# Load data from CSV files. With gunicorn --preload the CSVs are parsed once, before
+# the workers are forked (each worker still ends up with its own copy of the frames).
+# The threads of a worker share them and the tables and caches below are derived from
+# them, so callbacks must never modify these frames in place.
 articles_df = pd.read_csv("attached_assets/temp_chemwatch_all_articles_dev.csv")
 companies_df = pd.read_csv("attached_assets/temp_chemwatch_all_companies_dev.csv")
 
@@ -26,63 +37,158 @@ companies_df = pd.read_csv("attached_assets/temp_chemwatch_all_companies_dev.csv
 articles_df["published_at"] = pd.to_datetime(articles_df["published_at"], errors="coerce")
 articles_df["modified_at"] = pd.to_datetime(articles_df["modified_at"], errors="coerce")
 
-# Parse date columns
-articles_df["published_at"] = pd.to_datetime(articles_df["published_at"], errors="coerce")
-articles_df["modified_at"] = pd.to_datetime(articles_df["modified_at"], errors="coerce")
+# Articles table rows, formatted once at load time (see get_articles)
+articles_table_df = pd.DataFrame(
+    {
+        "pk": articles_df["primary_key"],
+        "article_id": articles_df["article_id"].fillna(""),
+        "title": ("[" + articles_df["title"] + "](" + articles_df["url"] + ")").fillna(""),
+        "url": articles_df["url"].fillna(""),
+        "published_at": articles_df["published_at"].dt.strftime("%Y-%m-%d %H:%M").fillna(""),
+        "country_code": articles_df["country_code"].fillna(""),
+        "isic_name": articles_df["isic_name"].fillna(""),
+        "search_term": articles_df["search_term"].fillna(""),
+    }
+)
+
+# Companies table rows, formatted once at load time (see get_companies)
+settlement_amount = companies_df["settlement_amount"]
+# Amounts are shown without decimals; ranges (e.g. "10500000000.00 to
+# 12500000000.00") and other non-numeric values are shown as they are
+settlement_amount_text = (
+    pd.to_numeric(settlement_amount, errors="coerce")
+    .map("{:,.0f}".format, na_action="ignore")
+    .fillna(settlement_amount.astype(str))
+)
+companies_table_df = pd.DataFrame(
+    {
+        "pk": companies_df["primary_key"].astype(str),
+        "company_name": companies_df["company_name"].fillna(""),
+        "litigation_reason": companies_df["litigation_reason"].fillna(""),
+        "claim_category": companies_df["claim_category"].fillna(""),
+        "source_of_pfas": companies_df["source_of_pfas"].fillna(""),
+        "settlement_finalized": np.where(
+            companies_df["settlement_finalized"].astype(bool), "Yes", "No"
+        ),
+        "settlement_amount": (
+            companies_df["settlement_currency"].fillna("") + " " + settlement_amount_text
+        )
+        .str.strip()
+        .where(settlement_amount.notna(), ""),
+        "settlement_paid_date": (
+            companies_df["settlement_paid_date"]
+            .astype(str)
+            .where(companies_df["settlement_paid_date"].notna(), "")
+        ),
+    }
+)
+
+# Number of companies per article primary key (companies count of a selected article)
+COMPANY_COUNTS_BY_ARTICLE_PK = companies_df["primary_key"].value_counts().to_dict()
+
+# Dropdown options; the data is static, so they are built once at load time
+# (categories are the sorted unique values without NaN)
+COMPANY_OPTIONS = [
+    {"label": company, "value": company}
+    for company in pd.Categorical(companies_df["company_name"]).categories
+]
+INDUSTRY_OPTIONS = [
+    {"label": industry, "value": industry}
+    for industry in pd.Categorical(articles_df["isic_name"]).categories
+]
+
+# Row positions in articles_df of the articles of every company (company filter)
+_company_articles = companies_df[["company_name", "primary_key"]].merge(
+    pd.DataFrame(
+        {"primary_key": articles_df["primary_key"], "position": np.arange(len(articles_df))}
+    ),
+    on="primary_key",
+)
+ARTICLE_POSITIONS_BY_COMPANY_NAME = {
+    company: positions.to_numpy()
+    for company, positions in _company_articles.groupby("company_name")["position"]
+}
 
 # Create Dash app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server  # maybe replace by init_login_manager() from Hercules
 
+# Dev server debug mode (reloader, dev tools); off unless DASH_DEBUG=true
+DEBUG = os.getenv("DASH_DEBUG", "false").lower() in ("1", "true")
+
+# Configure logging (debug messages such as the callback triggers only in debug mode)
+logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO)
+
+# Upper bound of dots sent to the browser for the scatter plot
+MAX_SCATTER_POINTS = 5000
+
+# Period names shown in the chart for each aggregation type
+MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI = {
+    "weekly": "Week",
+    "quarterly": "Quarter",
+    "monthly": "Month",
+}
+
+# Hover text of the scatter plot dots (indices refer to the customdata columns)
+# TODO: wrap text does not work with <b style="display: inline-block;
+#       max-width: 600px; word-wrap: break-word; white-space: normal;">
+HOVER_TEMPLATES = {
+    aggregation_type: (
+        f'<b style="display: inline-block; max-width: 600px; '
+        f'word-wrap: break-word; white-space: normal;">%{{customdata[0]}}</b><br>'
+        f'Published: %{{customdata[4]}}<br>'
+        f'{period_label}: %{{customdata[5]}}<extra></extra>'
+    )
+    for aggregation_type, period_label in MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI.items()
+}
+
+# Figure shown when the filters match no articles
+EMPTY_FIG = go.Figure()
+EMPTY_FIG.add_annotation(
+    text="No data available for the selected filters",
+    xref="paper",
+    yref="paper",
+    x=0.5,
+    y=0.5,
+    xanchor="center",
+    yanchor="middle",
+    showarrow=False,
+    font={"size": 16, "color": "gray"},
+)
+EMPTY_FIG.update_layout(xaxis={"visible": False}, yaxis={"visible": False})
 
-def get_articles(company_filter=None, industry_filter=None, article_pk=None):
-    """Get filtered articles"""
-    try:
-        df = articles_df.copy()
+# One term of a DataTable filter_query, e.g. '{country_code} icontains "US"'
+FILTER_TERM_RE = re.compile(r"\{(?P<column>[^}]+)\} (?P<op>\S+) (?P<value>.+)")
+FILTER_OPERATORS = {"=": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+TEXT_FILTER_OPERATORS = {"contains", "datestartswith", *FILTER_OPERATORS.values()}
 
-        if company_filter:
-            company_pks = companies_df[
-                companies_df["company_name"].isin(company_filter)
-            ]["primary_key"].tolist()
-            if company_pks:
-                df = df[df["primary_key"].isin(company_pks)]
-            else:
-                return pd.DataFrame()  # No matching companies found
 
-        if industry_filter:
-            df = df[df["isic_name"].isin(industry_filter)]
+def compute_mask(company_filter=None, industry_filter=None, article_filter=None):
+    """Get boolean mask over articles_df for the given filters"""
+    mask = np.ones(len(articles_df), dtype=bool)
 
-        if article_pk:
-            df = df.loc[df.primary_key==article_pk]
+    if company_filter:
+        company_mask = np.zeros(len(articles_df), dtype=bool)
+        for company in company_filter:
+            company_mask[ARTICLE_POSITIONS_BY_COMPANY_NAME.get(company, [])] = True
+        mask &= company_mask
 
-        # Sort by published date descending
-        df = df.sort_values("published_at", ascending=False, na_position="last")
+    if industry_filter:
+        mask &= articles_df["isic_name"].isin(industry_filter).to_numpy()
 
-        # Format data for display
-        data = []
-        for _, article in df.iterrows():
-            data.append(
-                {
-                    "pk": article["primary_key"],
-                    "article_id": article["article_id"] or "",
-                    "title": (
-                        f"[{article['title']}]({article['url']})" if pd.notna(article["title"]) else ""
-                    ),
-                    "url": article["url"] or "",
-                    "published_at": article["published_at"].strftime("%Y-%m-%d %H:%M") or "",
-                    "country_code": article["country_code"] or "",
-                    "isic_name": article["isic_name"] or "",
-                    "search_term": article["search_term"] or "",
-                    # "company_name": article["company_name"] or "",
-                    # "litigation_reason": article["litigation_reason"] or "",
-                    # "claim_category": article["claim_category"] or "",
-                    # "source_of_pfas": article["source_of_pfas"] or "",
-                    # "settlement_amount": article["settlement_amount"] or "",
-                    # "settlement_paid_date": article["settlement_paid_date"] or "",
-                },
-            )
+    if article_filter:
+        mask &= (articles_df["primary_key"] == article_filter).to_numpy()
 
-        return pd.DataFrame(data)
+    return mask
+
+
+def get_articles(mask):
+    """Get articles selected by mask (see compute_mask)"""
+    try:
+        # Sort by published date descending
+        published_at = articles_df.loc[mask, "published_at"]
+        order = published_at.sort_values(ascending=False, na_position="last").index
+        return articles_table_df.loc[order].reset_index(drop=True)
     except Exception as e:
         logging.error(f"Error fetching articles: {str(e)}")
         return pd.DataFrame()
@@ -91,87 +197,45 @@ def get_articles(company_filter=None, industry_filter=None, article_pk=None):
 def get_companies(article_filter=None):
     """Get filtered companies"""
     try:
-        df = companies_df.copy()
+        df = companies_table_df
 
         if article_filter:
             # Filter companies based on article pk
-            df = df[df["primary_key"] == article_filter]
+            df = df[companies_df["primary_key"] == article_filter]
 
         # Sort by company name
         df = df.sort_values("company_name", na_position="last")
-
-        # Format data for display
-        data = []
-        for _, company in df.iterrows():
-            settlement_amount = ""
-            if pd.notna(company["settlement_amount"]):
-                currency = (
-                    str(company["settlement_currency"])
-                    if pd.notna(company["settlement_currency"])
-                    else ""
-                )
-                amount_str = str(company["settlement_amount"])
-
-                # Handle range values (e.g., "10500000000.00 to 12500000000.00")
-                if " to " in amount_str:
-                    settlement_amount = f"{currency} {amount_str}".strip()
-                else:
-                    try:
-                        amount = float(amount_str)
-                        settlement_amount = f"{currency} {amount:,.0f}".strip()
-                    except ValueError:
-                        settlement_amount = f"{currency} {amount_str}".strip()
-
-        # Format data for display
-        data = []
-        for _, company in df.iterrows():
-            data.append(
-                {
-                    "pk": str(company["primary_key"]),
-                    "company_name": company["company_name"] or "",
-                    "litigation_reason":  company["litigation_reason"] or "",
-                    "claim_category": company["claim_category"] or "",
-                    "source_of_pfas": company["source_of_pfas"] or "",
-                    "settlement_finalized": (
-                        "Yes" if company["settlement_finalized"] else "No"
-                    ),
-                    "settlement_amount": settlement_amount,
-                    "settlement_paid_date": (
-                        str(company["settlement_paid_date"])
-                        if pd.notna(company["settlement_paid_date"])
-                        else ""
-                    ),
-                },
-            )
-
-        return pd.DataFrame(data)
+        return df.reset_index(drop=True)
     except Exception as e:
         logging.error(f"Error fetching companies: {str(e)}")
         return pd.DataFrame()
 
 
-def get_scatter_plot_data(
-    company_filter=None,
-    industry_filter=None,
-    article_filter=None,
-    aggregation_type="weekly",
-):
+def get_periods(published_at, aggregation_type):
+    """Get the period key (x-axis value) and period name of every publication date"""
+    if aggregation_type == "weekly":
+        # Start of the week (Monday) and ISO week number
+        period_start = published_at - pd.to_timedelta(published_at.dt.weekday, unit="D")
+        iso = period_start.dt.isocalendar()
+        period_key = period_start.dt.strftime("%Y-%m-%d")
+        period_name = iso["year"].astype(str) + "-" + iso["week"].astype(str).str.zfill(2)
+    elif aggregation_type == "quarterly":
+        # Start month of the quarter
+        year = published_at.dt.year.astype(str)
+        quarter = published_at.dt.quarter
+        period_key = year + "-" + ((quarter - 1) * 3 + 1).astype(str).str.zfill(2)
+        period_name = year + "-Q" + quarter.astype(str)
+    else:  # monthly
+        period_key = published_at.dt.strftime("%Y-%m")
+        period_name = published_at.dt.strftime("%Y-%b")  # Jan, Feb
+    return period_key, period_name
+
+
+def get_scatter_plot_data(mask, aggregation_type="weekly"):
     """Get data for scatter plot showing articles published per week or month"""
     try:
-        art_df = articles_df.copy()
-        com_df = companies_df.copy()
-
-        if company_filter:
-            company_pks = companies_df[companies_df["company_name"].isin(company_filter)][
-                "primary_key"
-            ]
-            art_df = art_df[art_df["primary_key"].isin(company_pks)]
-
-        if industry_filter:
-            art_df = art_df[art_df["isic_name"] == industry_filter]
-
-        if article_filter:
-            art_df = art_df[art_df["primary_key"] == article_filter]
+        art_df = articles_df[mask]
+        com_df = companies_df
 
         # Filter out rows with null published_at
         art_df = art_df[pd.notna(art_df["published_at"])]
@@ -205,60 +269,29 @@ def get_scatter_plot_data(
         # Join with companies data to get liability information
         df = art_df.merge(grouped_com_df, on="primary_key", how="left")
 
-        data = []
-        for _, article in df.iterrows():
-            if aggregation_type == "weekly":
-                # Get the start of the week (Monday)
-                period_start = article["published_at"] - pd.Timedelta(
-                    days=article["published_at"].weekday(),
-                )
-                iso_year, iso_week, _ = period_start.isocalendar()
-                period_key = period_start.strftime("%Y-%m-%d")
-                period_name = f"{iso_year}-{iso_week:02d}"
-            elif aggregation_type == "quarterly":
-                # Get the start of the quarter
-                quarter = (article["published_at"].month - 1) // 3 + 1
-                period_start = pd.Timestamp(
-                    year=article["published_at"].year,
-                    month=(quarter - 1) * 3 + 1,
-                    day=1,
-                )
-                iso_year = period_start.year
-                period_key = period_start.strftime("%Y-%m")
-                period_name = f"{iso_year}-Q{quarter}"
-            else:  # monthly
-                # Get the start of the month
-                period_start = article["published_at"].replace(day=1)
-                iso_year = period_start.year
-                period_key = period_start.strftime("%Y-%m")
-                period_name = f"{iso_year}-{period_start.strftime('%b')}"  # Jan, Feb
-
-            data.append(
-                {
-                    "period": period_key,
-                    "title": (
-                        str(article["title"]) if pd.notna(article["title"]) else ""
-                    ),
-                    "published_at": article["published_at"],
-                    "primary_key": str(article["primary_key"]),
-                    "url": article["url"],
-                    "published_on": article["published_at"].strftime("%Y-%m-%d"),
-                    "country": article[
-                        "country_code"
-                    ],  # TODO: return country name from country code
-                    "industry_isic": article["isic_name"],
-                    "period_name": period_name,
-                    "company_name": article["company_name"],
-                    "litigation_reason": article["litigation_reason"],
-                    "claim_category": article["claim_category"],
-                    "source_of_pfas": article["source_of_pfas"],
-                    "settlement_finalized": article["settlement_finalized"],
-                    "settlement_amount": article["settlement_amount"],
-                    "settlement_paid_date": article["settlement_paid_date"],
-                },
-            )
-
-        plot_df = pd.DataFrame(data)
+        # Period of every article, computed column-wise (see get_periods)
+        df["period"], df["period_name"] = get_periods(df["published_at"], aggregation_type)
+
+        plot_df = pd.DataFrame(
+            {
+                "period": df["period"],
+                "title": df["title"].fillna("").astype(str),
+                "published_at": df["published_at"],
+                "primary_key": df["primary_key"].astype(str),
+                "url": df["url"],
+                "published_on": df["published_at"].dt.strftime("%Y-%m-%d"),
+                "country": df["country_code"],  # TODO: return country name from country code
+                "industry_isic": df["isic_name"],
+                "period_name": df["period_name"],
+                "company_name": df["company_name"],
+                "litigation_reason": df["litigation_reason"],
+                "claim_category": df["claim_category"],
+                "source_of_pfas": df["source_of_pfas"],
+                "settlement_finalized": df["settlement_finalized"],
+                "settlement_amount": df["settlement_amount"],
+                "settlement_paid_date": df["settlement_paid_date"],
+            }
+        )
         if not plot_df.empty:
             # Group by period and add vertical positioning for dots (starting from 1)
             plot_df_grouped = (
@@ -279,20 +312,81 @@ def get_scatter_plot_data(
         return pd.DataFrame()
 
 
-def get_company_options():
-    """Get options for company dropdown"""
-    company_names = companies_df["company_name"].unique()
-    company_names = sorted(company_names)
-    options = [{"label": company, "value": company} for company in company_names]
-    return options
+@functools.lru_cache(maxsize=32)
+def get_chart_data(company_filter, industry_filter, aggregation_type):
+    """Get the scatter plot data for the filters given as tuples, memoized
+
+    The chart data does not depend on the date filters, which only move the
+    visible range, so dragging the range slider reuses it. Callers must not
+    modify the returned frame.
+    """
+    return get_scatter_plot_data(compute_mask(company_filter, industry_filter), aggregation_type)
+
+
+def downsample_scatter_data(scatter_data, max_points=MAX_SCATTER_POINTS):
+    """Cap the dots per period to send about max_points dots (at least one per period)"""
+    if len(scatter_data) <= max_points:
+        return scatter_data
+
+    # Keep every stride-th dot of the periods with too many dots, counted from the
+    # newest article, so the sample spans the whole period. The dots keep their
+    # y_position, so the column height still shows the number of articles.
+    max_dots_per_period = max(1, max_points // scatter_data["period"].nunique())
+    dots_per_period = scatter_data.groupby("period")["y_position"].transform("max")
+    stride = np.ceil(dots_per_period / max_dots_per_period)
+    return scatter_data[(dots_per_period - scatter_data["y_position"]) % stride == 0]
+
+
+def filter_and_sort_table(df, sort_by, filter_query):
+    """Apply the DataTable filter_query and sort_by (custom filter/sort actions) to df"""
+    for term in (filter_query or "").split(" && "):
+        match = FILTER_TERM_RE.fullmatch(term.strip())
+        if not match or match["column"] not in df.columns:
+            continue
+
+        # Operators may be prefixed with i (case insensitive) or s (case sensitive),
+        # symbolic ones included (e.g. "i=" or "s>=")
+        op = match["op"]
+        case_sensitive = False
+        if op[0] in "is" and FILTER_OPERATORS.get(op[1:], op[1:]) in TEXT_FILTER_OPERATORS:
+            case_sensitive, op = op[0] == "s", op[1:]
+        op = FILTER_OPERATORS.get(op, op)
+
+        value = match["value"].strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1]
+        column = df[match["column"]].astype(str)
+        if not case_sensitive:
+            column, value = column.str.lower(), value.lower()
+
+        if op == "contains":
+            df = df[column.str.contains(value, regex=False)]
+        elif op == "datestartswith":
+            df = df[column.str.startswith(value)]
+        elif op in TEXT_FILTER_OPERATORS:
+            df = df[getattr(operator, op)(column, value)]
+
+    if sort_by:
+        df = df.sort_values(
+            [col["column_id"] for col in sort_by],
+            ascending=[col["direction"] == "asc" for col in sort_by],
+            kind="stable",
+        )
+    return df
+
 
+def get_table_page(df, page_current, page_size, sort_by, filter_query):
+    """Get the records of the current table page and the number of pages"""
+    df = filter_and_sort_table(df, sort_by, filter_query)
+    page = df.iloc[page_current * page_size : (page_current + 1) * page_size]
+    return page.to_dict("records"), max(1, math.ceil(len(df) / page_size))
 
-def get_industry_options():
-    """Get options for industry dropdown"""
-    industry_names = articles_df["isic_name"].unique()
-    industry_names = sorted(industry_names)
-    options = [{"label": industry, "value": industry} for industry in industry_names]
-    return options
+
+def get_selected_value(selected_rows, page_records, column):
+    """Get column of the first selected row (selected rows index into the shown page)"""
+    if selected_rows and selected_rows[0] < len(page_records or []):
+        return page_records[selected_rows[0]][column]
+    return None
 
 
 def draw_info_box(
@@ -516,6 +610,7 @@ app.layout = dbc.Container(
                                         dbc.Label("Company Filter"),
                                         dcc.Dropdown(
                                             id="company-filter",
+                                            options=COMPANY_OPTIONS,
                                             placeholder="Select company...",
                                             multi=True,
                                             style={
@@ -533,6 +628,7 @@ app.layout = dbc.Container(
                                         dbc.Label("Industry Filter"),
                                         dcc.Dropdown(
                                             id="industry-filter",
+                                            options=INDUSTRY_OPTIONS,
                                             placeholder="Select industry...",
                                             multi=True,
                                             style={
@@ -711,11 +807,12 @@ app.layout = dbc.Container(
                                                 },
                                             ],
                                             data=[],
-                                            sort_action="native",
+                                            # Filter, sort and paginate on the server (see update_articles_table)
+                                            sort_action="custom",
                                             sort_by=[{"column_id": "published_at", "direction": "desc"}],
-                                            filter_action="native",
+                                            filter_action="custom",
                                             filter_options={"case": "insensitive"},
-                                            page_action="native",
+                                            page_action="custom",
                                             page_current=0,
                                             page_size=10,
                                             row_selectable="multi",
@@ -827,10 +924,12 @@ app.layout = dbc.Container(
                                                 },
                                             ],
                                             data=[],
-                                            sort_action="native",
-                                            filter_action="native",
+                                            # Filter, sort and paginate on the server (see update_companies_table)
+                                            sort_action="custom",
+                                            sort_by=[],
+                                            filter_action="custom",
                                             filter_options={"case": "insensitive"},
-                                            page_action="native",
+                                            page_action="custom",
                                             page_current=0,
                                             page_size=10,
                                             row_selectable="single",
@@ -902,7 +1001,7 @@ app.layout = dbc.Container(
         Input("monthly-btn", "n_clicks"),
         Input("quarterly-btn", "n_clicks"),
     ],
-    prevent_initial_call=False,
+    prevent_initial_call=True,  # the layout already renders the "monthly" default
 )
 @log_callback_trigger
 def update_aggregation_type(weekly_clicks, monthly_clicks, quarterly_clicks):
@@ -910,7 +1009,7 @@ def update_aggregation_type(weekly_clicks, monthly_clicks, quarterly_clicks):
     if not ctx.triggered:
         return "monthly", "outline-primary", "primary", "outline-primary"
 
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
+    button_id = ctx.triggered_id
 
     if button_id == "weekly-btn":
         return "weekly", "primary", "outline-primary", "outline-primary"
@@ -924,22 +1023,10 @@ def update_aggregation_type(weekly_clicks, monthly_clicks, quarterly_clicks):
 
 # Main dashboard callback
 @app.callback(
-    Output("articles-table", "data"),
-    Output("companies-table", "data"),
     Output("scatter-plot-chart", "figure"),
-    Output("article-count", "children"),
-    Output("company-count", "children"),
-    Output("filter-status", "children"),
-    Output("selected-article-pk", "children"),
-    Output("selected-company-pk", "children"),
-    Output("company-filter", "options"),
-    Output("industry-filter", "options"),
     
     Input("company-filter", "value"),
     Input("industry-filter", "value"),
-    Input("articles-table", "selected_rows"),
-    Input("companies-table", "selected_rows"),
-    Input("clear-filters", "n_clicks"),
     Input("aggregation-type", "children"),
     Input("start-date-filter", "date"),
     Input("end-date-filter", "date"),
@@ -949,84 +1036,25 @@ def update_aggregation_type(weekly_clicks, monthly_clicks, quarterly_clicks):
 def update_dashboard(
     company_filter,
     industry_filter,
-    selected_article_rows,
-    selected_company_rows,
-    clear_clicks,
     aggregation_type,
     start_date,
     end_date,
 ):
-    ctx = callback_context
+    # "Clear filters" is handled by clear_filters, which resets the filter values
+    # (the inputs above), so this callback runs once per clear
 
-    # Handle clear filters: when only the button "clear filters" is clicked
-    if (
-        ctx.triggered
-        and ctx.triggered[0]["prop_id"] == "clear-filters.n_clicks"
-        and clear_clicks
-    ):
-        company_filter = None
-        industry_filter = None
-        selected_article_rows = []
-        selected_company_rows = []
-
-    # Get dropdown options
-    company_options = get_company_options()
-    industry_options = get_industry_options()
-
-    # Get selected article PK (for companies table filtering only)
-    selected_article_pk = None
-    if selected_article_rows:
-        articles_data_temp = get_articles(company_filter, industry_filter)
-        if not (articles_data_temp.empty and 
-                selected_article_rows[0] < len(articles_data_temp)
-        ):
-            selected_article_pk = articles_data_temp.iloc[selected_article_rows[0]][
-                "pk"
-            ]
-
-    # Get selected company PK (not used for chart filtering)
-    selected_company_pk = None
-    if selected_company_rows:
-        companies_data_temp = get_companies(selected_article_pk)
-        if not companies_data_temp.empty and selected_company_rows[0] < len(
-            companies_data_temp
-        ):
-            selected_company_pk = companies_data_temp.iloc[selected_company_rows[0]][
-                "company_name"
-            ]
-
-    # Get filtered data (chart only uses main filters, not table selections)
-    articles_data = get_articles(company_filter, industry_filter)
-    companies_data = get_companies(
-        selected_article_pk,
-    )  # Companies table still filtered by selected article
-    scatter_data = get_scatter_plot_data(
-        company_filter,
-        industry_filter,
-        None,   # Chart ignores table selections
-        aggregation_type,
-    )  
-
-    # Update articles table
-    articles_records = (
-        articles_data.to_dict("records") if not articles_data.empty else []
-    )
-
-    # Update companies table
-    companies_records = (
-        companies_data.to_dict("records") if not companies_data.empty else []
+    # Chart only uses main filters, not table selections
+    scatter_data = get_chart_data(
+        tuple(company_filter or ()), tuple(industry_filter or ()), aggregation_type
     )
 
     # This code introduces dynamic range slider configuration with data-driven min/max values,
     # 2-year pre-selected range, and enhanced user interaction features.
     # Update scatter plot
-    MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI = {
-        "weekly": "Week",
-        "quarterly": "Quarter",
-        "monthly": "Month",
-    }
     if not scatter_data.empty:
-        period_label = MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI.get(aggregation_type, "Month")
+        if aggregation_type not in MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI:
+            aggregation_type = "monthly"
+        period_label = MAP_AGGREGATION_TYPE_TO_NAME_FOR_UI[aggregation_type]
 
         # Calculate data-driven range slider bounds from original data
         data_min_date = scatter_data["published_at"].min()
@@ -1044,23 +1072,28 @@ def update_dashboard(
             )  # Don't go before data starts
             preselected_end = data_max_date
 
+        # Limit the number of dots serialized to the browser (range above uses all data)
+        article_count = len(scatter_data)
+        scatter_data = downsample_scatter_data(scatter_data)
+        if len(scatter_data) < article_count:
+            title_note = (
+                f"Showing an even sample of {len(scatter_data):,} of {article_count:,} "
+                "articles, each dot represents one article"
+            )
+        else:
+            title_note = "Each dot represents one article"
+
         fig = px.scatter(
             scatter_data,
             x="period",
             y="y_position",
             hover_data=["title", "published_at"],
-            title=f"Articles published by {period_label} (Each dot represents one article)",
+            title=f"Articles published by {period_label} ({title_note})",
+            render_mode="webgl",  # scattergl: WebGL keeps zoom/hover fast for many dots
         )
         fig.update_traces(
             marker={"size": 8, "opacity": 0.7},
-            # TODO: wrap text does not work with <b style="display: inline-block;
-            #       max-width: 600px; word-wrap: break-word; white-space: normal;">
-            hovertemplate = (
-                f'<b style="display: inline-block; max-width: 600px; '
-                f'word-wrap: break-word; white-space: normal;">%{{customdata[0]}}</b><br>'
-                f'Published: %{{customdata[4]}}<br>'
-                f'{period_label}: %{{customdata[5]}}<extra></extra>'
-            ),
+            hovertemplate=HOVER_TEMPLATES[aggregation_type],
             customdata=scatter_data[
                 [
                     "title",
@@ -1158,23 +1191,49 @@ def update_dashboard(
             },
         )
     else:
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No data available for the selected filters",
-            xref="paper",
-            yref="paper",
-            x=0.5,
-            y=0.5,
-            xanchor="center",
-            yanchor="middle",
-            showarrow=False,
-            font={"size": 16, "color": "gray"},
-        )
-        fig.update_layout(xaxis={"visible": False}, yaxis={"visible": False})
+        fig = EMPTY_FIG
+
+    return fig
+
+
+# Cheap status outputs, kept out of update_dashboard so they don't rebuild the chart
+@app.callback(
+    Output("article-count", "children"),
+    Output("company-count", "children"),
+    Output("filter-status", "children"),
+    Output("selected-article-pk", "children"),
+    Output("selected-company-pk", "children"),
+    Input("company-filter", "value"),
+    Input("industry-filter", "value"),
+    Input("articles-table", "selected_rows"),
+    Input("companies-table", "selected_rows"),
+    State("articles-table", "data"),
+    State("companies-table", "data"),
+    prevent_initial_call=False,
+)
+@log_callback_trigger
+def update_filter_status(
+    company_filter,
+    industry_filter,
+    selected_article_rows,
+    selected_company_rows,
+    articles_page,
+    companies_page,
+):
+    # Selected article PK (the companies table is filtered by it)
+    selected_article_pk = get_selected_value(selected_article_rows, articles_page, "pk")
+    selected_company_pk = get_selected_value(
+        selected_company_rows, companies_page, "company_name"
+    )
 
-    # Update counts
-    article_count = f"{len(articles_data)} articles"
-    company_count = f"{len(companies_data)} companies"
+    # Update counts (companies table is filtered by the selected article)
+    n_companies = (
+        COMPANY_COUNTS_BY_ARTICLE_PK.get(selected_article_pk, 0)
+        if selected_article_pk
+        else len(companies_df)
+    )
+    article_count = f"{compute_mask(company_filter, industry_filter).sum()} articles"
+    company_count = f"{n_companies} companies"
 
     # Update filter status (only show main filters, not table selections)
     filters = []
@@ -1188,18 +1247,12 @@ def update_dashboard(
     else:
         filter_status = "No filters applied"
 
-
     return (
-        articles_records,
-        companies_records,
-        fig,
         article_count,
         company_count,
         filter_status,
         selected_article_pk or "",
         selected_company_pk or "",
-        company_options,
-        industry_options,
     )
 
 
@@ -1209,19 +1262,95 @@ def update_dashboard(
         Output("industry-filter", "value"),
         Output("articles-table", "filter_query"),
         Output("companies-table", "filter_query"),
+        Output("articles-table", "selected_rows", allow_duplicate=True),
+        Output("companies-table", "selected_rows", allow_duplicate=True),
     ],
     [Input("clear-filters", "n_clicks")],
+    prevent_initial_call=True,
 )
 @log_callback_trigger
 def clear_filters(n_clicks):
     ctx = callback_context
-    if (
-        ctx.triggered
-        and ctx.triggered[0]["prop_id"] == "clear-filters.n_clicks"
-        and n_clicks
-    ):
-        return [None, None, "", ""]
-    return [dash.no_update, dash.no_update, dash.no_update, dash.no_update]
+    if ctx.triggered_id == "clear-filters" and n_clicks:
+        return [None, None, "", "", [], []]
+    return [dash.no_update] * 6
+
+
+# Callbacks serving one page of the tables (server-side filtering, sorting and paging)
+@app.callback(
+    Output("articles-table", "data"),
+    Output("articles-table", "page_count"),
+    Output("articles-table", "page_current"),
+    Output("articles-table", "selected_rows"),
+    Input("company-filter", "value"),
+    Input("industry-filter", "value"),
+    Input("articles-table", "page_current"),
+    Input("articles-table", "page_size"),
+    Input("articles-table", "sort_by"),
+    Input("articles-table", "filter_query"),
+    State("articles-table", "selected_rows"),
+    prevent_initial_call=False,
+)
+@log_callback_trigger
+def update_articles_table(
+    company_filter,
+    industry_filter,
+    page_current,
+    page_size,
+    sort_by,
+    filter_query,
+    selected_rows,
+):
+    # Go back to the first page when the rows behind the pages change
+    if "articles-table.page_current" not in callback_context.triggered_prop_ids:
+        page_current = 0
+
+    articles_data = get_articles(compute_mask(company_filter, industry_filter))
+    records, page_count = get_table_page(
+        articles_data, page_current, page_size, sort_by, filter_query
+    )
+
+    # Selected rows are page indices, so they no longer apply to the new page
+    return records, page_count, page_current, [] if selected_rows else dash.no_update
+
+
+@app.callback(
+    Output("companies-table", "data"),
+    Output("companies-table", "page_count"),
+    Output("companies-table", "page_current"),
+    Output("companies-table", "selected_rows"),
+    Input("articles-table", "selected_rows"),
+    Input("companies-table", "page_current"),
+    Input("companies-table", "page_size"),
+    Input("companies-table", "sort_by"),
+    Input("companies-table", "filter_query"),
+    State("articles-table", "data"),
+    State("companies-table", "selected_rows"),
+    prevent_initial_call=False,
+)
+@log_callback_trigger
+def update_companies_table(
+    selected_article_rows,
+    page_current,
+    page_size,
+    sort_by,
+    filter_query,
+    articles_page,
+    selected_rows,
+):
+    # Go back to the first page when the rows behind the pages change
+    if "companies-table.page_current" not in callback_context.triggered_prop_ids:
+        page_current = 0
+
+    # Companies table is filtered by the selected article
+    selected_article_pk = get_selected_value(selected_article_rows, articles_page, "pk")
+    companies_data = get_companies(selected_article_pk)
+    records, page_count = get_table_page(
+        companies_data, page_current, page_size, sort_by, filter_query
+    )
+
+    # Selected rows are page indices, so they no longer apply to the new page
+    return records, page_count, page_current, [] if selected_rows else dash.no_update
 
 
 # Callback for handling click events on scatter plot
@@ -1241,10 +1370,7 @@ def display_article_info(
     ctx = callback_context
     
     # Only process if "click data" triggered the callback
-    if (ctx.triggered and 
-        click_data and
-        ctx.triggered[0]["prop_id"] == "scatter-plot-chart.clickData"
-        ):
+    if ctx.triggered_id == "scatter-plot-chart" and click_data:
         try:
             # Get the clicked point data
             point = click_data["points"][0]
@@ -1288,10 +1414,7 @@ def display_article_info(
                 [dbc.Alert("Error loading article information from chart", color="danger")]
             )
         
-    elif (ctx.triggered and 
-        selected_article_rows and
-        ctx.triggered[0]["prop_id"] == "articles-table.selected_rows"
-        ):
+    elif ctx.triggered_id == "articles-table" and selected_article_rows:
         try:
             print(articles_data)
             one_article_is_selected = len(selected_article_rows)==1
@@ -1303,7 +1426,7 @@ def display_article_info(
             primary_key = articles_data[pk]["pk"]
             print(f"primary_key {primary_key}")
 
-            article_data = get_scatter_plot_data(article_filter=primary_key)
+            article_data = get_scatter_plot_data(compute_mask(article_filter=primary_key))
             print(f"article_data {article_data}")
             article_data = article_data.to_dict("records")
             print(f"article_data {article_data}")
@@ -1370,4 +1493,4 @@ def sync_date_filters_with_range_slider(relayout_data):
 
 
 if __name__ == '__main__':
-    app.run_server(host='0.0.0.0', port=5000, debug=True)
+    app.run_server(host='0.0.0.0', port=5000, debug=DEBUG)
@@ -5,5 +5,6 @@ from dash_app import app
 app = app.server
 
 if __name__ == '__main__':
-    from dash_app import app as dash_app
-    dash_app.run_server(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs gunicorn (see .replit)
+    from dash_app import app as dash_app, DEBUG
+    dash_app.run_server(host='0.0.0.0', port=5000, debug=DEBUG)
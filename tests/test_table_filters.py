@@ -0,0 +1,45 @@
+"""Tests for the custom DataTable filtering in dash_app (run from the repository root)"""
+
+import unittest
+
+import pandas as pd
+
+from dash_app import filter_and_sort_table
+
+TABLE_DF = pd.DataFrame(
+    {
+        "country_code": ["US", "us", "DE", "FR"],
+        "published_at": ["2025-05-30", "2025-06-12", "2025-07-01", "2024-12-24"],
+    }
+)
+
+
+def filtered_rows(filter_query):
+    """Get the row positions of TABLE_DF left by filter_query"""
+    df = filter_and_sort_table(TABLE_DF, [], filter_query)
+    return [TABLE_DF.index.get_loc(index) for index in df.index]
+
+
+class FilterOperatorTest(unittest.TestCase):
+    def test_insensitive_equals(self):
+        self.assertEqual(filtered_rows("{country_code} i= US"), [0, 1])
+
+    def test_sensitive_equals(self):
+        self.assertEqual(filtered_rows("{country_code} s= US"), [0])
+
+    def test_insensitive_greater_than(self):
+        self.assertEqual(filtered_rows("{published_at} i> 2025-06"), [1, 2])
+
+    def test_insensitive_not_equals(self):
+        self.assertEqual(filtered_rows("{country_code} i!= us"), [2, 3])
+
+    def test_insensitive_contains(self):
+        self.assertEqual(filtered_rows('{country_code} icontains "u"'), [0, 1])
+
+    def test_unprefixed_operators(self):
+        self.assertEqual(filtered_rows("{country_code} = US"), [0, 1])
+        self.assertEqual(filtered_rows("{country_code} ieq US"), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@ Module: user_management.auth
 It includes user loading, login manager initialization, and a user class definition.
 - `User`: Represents a us er in the system with attributes such as user_id, name, email, admin_access, and approved.
 - `load_user(user_id: int) -> User | None`: Loads a user from the database based on the provided user ID.
+- `get_pg() -> PostgresService`: Returns the shared database service, created on first use.
+- `hash_token(token: str) -> str`: Hashes a magic link token for storage and lookup.
 - `init_login_manager(server)`: Configures the login manager for the given server instance (e.g., a Flask app).
 Classes:
     User: Represents a user in the system with attributes such as user_id, name, email, admin_access, and approved.
@@ -11,13 +13,40 @@ Classes:
 from flask_login import (
     LoginManager,
     UserMixin,
+    current_user,
 )
 from utils.logger_config import logger
 from shared_code.connections.pg_service import PostgresService
+import functools
+import hashlib
 import os
+import time
 
 environment = os.getenv("ENVIRONMENT", "dev")
-pg = PostgresService(schema="chemwatch")
+
+# load_user runs on every request, so loaded users are kept for a short time
+# (user_id -> (expiry, User)); approval changes apply after at most this delay
+USER_CACHE_TTL = 60  # in seconds
+_user_cache = {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_pg() -> PostgresService:
+    """
+    Returns the PostgresService shared by the user_management modules.
+    It is created on first use rather than when the modules are imported.
+    """
+    return PostgresService(schema="chemwatch")
+
+
+def hash_token(token: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a magic link token.
+    Only the digest is stored in hercules_login_magic_link; the token itself is
+    only sent in the email link.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 login_manager = LoginManager()
 login_manager.login_view = "login"
@@ -58,6 +87,7 @@ class User(UserMixin):
 def load_user(user_id: int) -> User | None:
     """
     Loads a user from the database based on the provided user ID.
+    Found users are cached for USER_CACHE_TTL seconds.
     Args:
         user_id (int): The unique identifier of the user to be loaded.
     Returns:
@@ -65,21 +95,30 @@ def load_user(user_id: int) -> User | None:
     Raises:
         Exception: Logs an error and returns None if an exception occurs during the database query.
     """
-    query = "SELECT * FROM hercules_users WHERE user_id = :user_id"
+    cached = _user_cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    query = """
+        SELECT user_id, name, email, is_admin, is_approved
+        FROM hercules_users WHERE user_id = :user_id
+    """
     params = {"user_id": user_id}
 
     try:
-        result = pg.do_read(query, params)["data"]
+        result = get_pg().do_read(query, params)["data"]
 
         if not result.empty:
             user_record = result.iloc[0]
-            return User(
+            user = User(
                 user_id=int(user_record["user_id"]),
                 name=user_record["name"],
                 email=user_record["email"],
                 admin_access=user_record["is_admin"],
                 approved=user_record["is_approved"],
             )
+            _user_cache[user_id] = (time.monotonic() + USER_CACHE_TTL, user)
+            return user
         return None
 
     except Exception as e:
@@ -93,6 +132,8 @@ def init_login_manager(server):
 
     This function sets up the login manager by configuring the server's
     secret key and initializing the login manager with the server instance.
+    It also adds the `/whoami` route the login page uses to notice a login
+    from another tab.
 
     Args:
         server: The server instance (e.g., a Flask app) to configure the
@@ -106,4 +147,12 @@ def init_login_manager(server):
     server.config["SESSION_COOKIE_HTTPONLY"] = True
     server.config["SESSION_COOKIE_SECURE"] = True
     server.config["SESSION_COOKIE_SAMESITE"] = "Lax"
+
+    @server.route("/whoami")
+    def whoami():
+        """
+        Tells the login page whether the session is logged in (204) or not (401).
+        """
+        return ("", 204) if current_user.is_authenticated else ("", 401)
+
     return server
@@ -9,7 +9,8 @@ Layout Components:
     login and register buttons, and error messages.
 
 Callbacks:
-- `validate_email(email: str) -> str | bool`: Validates the email format.
+- clientside callback to validate the email format while typing
+- `validate_email(email: str) -> str | bool`: Validates the email format (server-side).
 - `send_magic_link(login_n_clicks: int, email: str, invalid_email: str | bool, url: str)
     -> tuple`: Handles sending the magic login link and error handling.
 - `update_logout(logout_n_clicks: int | None) -> str`: Handles the logout process.
@@ -18,7 +19,10 @@ Callbacks:
 
 import re
 import os
-import uuid
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import dash
 from dash import callback, Output, Input, State, clientside_callback, dcc
@@ -28,11 +32,24 @@ from dash_iconify import DashIconify
 from flask_login import logout_user
 from utils.logger_config import logger
 from utils.email_templates import magic_login_email_template
-from shared_code.connections.pg_service import PostgresService
 from layout_functions.email_automation import send_email
+from ..user_management.auth import get_pg, hash_token
 
 environment = os.getenv("ENVIRONMENT", "dev")
-pg = PostgresService(schema="chemwatch")
+
+# Allianz email addresses (compiled once, validate_email runs on every input change)
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@allianz\.(?:com|de)")
+EMAIL_DOMAINS = ("@allianz.com", "@allianz.de")
+
+# Magic link emails are sent in the background so that the login button responds
+# as soon as the link is stored
+mail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="magic_link_mail")
+
+# Magic link requests per email (time.monotonic()), one is allowed per interval.
+# The resend countdown enforces this in the browser; this also holds for direct requests.
+MAGIC_LINK_RESEND_SECONDS = 60
+_last_link_requests = {}
+_last_link_requests_lock = threading.Lock()
 
 login_layout = dmc.Center(
     [
@@ -116,14 +133,30 @@ login_layout = dmc.Center(
 )
 
 
-@callback(
+# Validates the email format when the focus changes from the email input field.
+# Runs in the browser; validate_email below is the same check on the server.
+clientside_callback(
+    """
+    function(email) {
+        if (!email) {
+            return "Email cannot be empty.";
+        }
+        if (/^[a-zA-Z0-9_.+-]+@allianz\\.(com|de)$/.test(email)) {
+            return false;
+        }
+        return "Invalid email format. Please enter a valid Allianz email " +
+            "(e.g., @allianz.com or @allianz.de).";
+    }
+    """,
     Output("email_box_login", "error"),
     Input("email_box_login", "value"),
     prevent_initial_call=True,
 )
+
+
 def validate_email(email: str) -> str | bool:
     """
-    Validates the email format when the focus changes from the email input field.
+    Validates the email format (server-side check of the login email box).
 
     Parameters:
     - email (str): The email entered by the user.
@@ -135,8 +168,8 @@ def validate_email(email: str) -> str | bool:
     if not email:
         return "Email cannot be empty."
 
-    email_regex = r"^[a-zA-Z0-9_.+-]+@allianz\.(com|de)$"
-    if re.match(email_regex, email):
+    # Cheap domain check first, the regex only runs for plausible addresses
+    if email.endswith(EMAIL_DOMAINS) and EMAIL_RE.fullmatch(email):
         return False
     return "Invalid email format. Please enter a valid Allianz email \
         (e.g., @allianz.com or @allianz.de)."
@@ -151,6 +184,7 @@ def validate_email(email: str) -> str | bool:
     Output("login_button", "children"),
     Output("poll_auth", "disabled"),
     Output("email_sent_flag", "data"),
+    Output("poll_auth", "interval"),
     Input("login_button", "n_clicks"),
     Input("email_box_login", "n_submit"),
     State("email_box_login", "value"),
@@ -189,7 +223,7 @@ def send_magic_link(
     Returns:
     - tuple: Outputs for updating the UI components.
     """
-    if validate_email(email):  # reusing the validate_email callback
+    if validate_email(email):  # re-check, the email box is validated clientside
         raise PreventUpdate
 
     if (
@@ -199,10 +233,18 @@ def send_magic_link(
     ):
         raise PreventUpdate
 
+    if _is_rate_limited(email):
+        logger.warning(f"Magic link requested again within a minute for {email}")
+        return _generate_error_response(
+            "A login link was sent less than a minute ago. Please check your email."
+        )
+
+    link_stored = False
     try:
         # Check if the email is registered
-        user_data = pg.do_read(
-            "SELECT * FROM hercules_users WHERE email = :email", {"email": email}
+        user_data = get_pg().do_read(
+            "SELECT name, is_approved FROM hercules_users WHERE email = :email LIMIT 1",
+            {"email": email},
         )["data"]
         if user_data.empty:
             logger.warning("Email not registered")
@@ -215,7 +257,7 @@ def send_magic_link(
             )
 
         # token and expiry time
-        token = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
         expiry_time = datetime.now() + timedelta(minutes=10)
 
         # Insert or update the magic link in the database
@@ -224,12 +266,14 @@ def send_magic_link(
             VALUES (:email, :token, :expiry)
             ON CONFLICT (email) DO UPDATE SET token = :token, expiry = :expiry
         """
-        insert_params = {"email": email, "token": token, "expiry": expiry_time}
-        if not pg.do_insert(insert_query, insert_params)["success"]:
+        # Only the hash of the token is stored
+        insert_params = {"email": email, "token": hash_token(token), "expiry": expiry_time}
+        if not get_pg().do_insert(insert_query, insert_params)["success"]:
             logger.error(f"Error inserting magic link for {email}")
             return _generate_error_response(
                 "An error occurred. Please try again later."
             )
+        link_stored = True
 
         # Send the magic login email
         base_url = url.rsplit("/", 1)[0]
@@ -239,6 +283,61 @@ def send_magic_link(
             magic_link=magic_link,
             year=datetime.now().year,
         )
+        mail_executor.submit(_send_magic_link_email, email, email_message)
+        return (
+            "Email Sent..!",
+            "A magic login link has been sent to your email. Please click on the link from the same device.",
+            False,
+            "blue",
+            True,
+            dmc.Loader(size="sm", color="blue"),
+            False,
+            60,
+            1000,  # the countdown ticks every second, also when resending
+        )
+
+    except Exception as e:
+        logger.error(f"Login error: {e}")
+        return _generate_error_response("An error occurred. Please try again later.")
+    finally:
+        # Requests that did not store a link don't count against the limit
+        if not link_stored:
+            _forget_link_request(email)
+
+
+def _is_rate_limited(email: str) -> bool:
+    """
+    Records a magic link request for the email and tells whether the previous one
+    was less than MAGIC_LINK_RESEND_SECONDS ago (then the request is not recorded).
+    """
+    email = email.lower()
+    now = time.monotonic()
+    with _last_link_requests_lock:
+        last_request = _last_link_requests.get(email)
+        if last_request is not None and now - last_request < MAGIC_LINK_RESEND_SECONDS:
+            return True
+        _last_link_requests[email] = now
+        # Forget requests that no longer limit anything
+        if len(_last_link_requests) > 1000:
+            for old_email, requested_at in list(_last_link_requests.items()):
+                if now - requested_at >= MAGIC_LINK_RESEND_SECONDS:
+                    del _last_link_requests[old_email]
+    return False
+
+
+def _forget_link_request(email: str) -> None:
+    """
+    Removes the magic link request recorded by _is_rate_limited for the email.
+    """
+    with _last_link_requests_lock:
+        _last_link_requests.pop(email.lower(), None)
+
+
+def _send_magic_link_email(email: str, email_message: str) -> None:
+    """
+    Sends the magic login email (runs on mail_executor, so failures are only logged).
+    """
+    try:
         if send_email(
             from_list="tmu-hercules-risk-monitoring@agcs.allianz.com",
             to_list=email,
@@ -247,54 +346,46 @@ def send_magic_link(
             logo_path="assets/hercules_logo_ai_factory_small.png",
         ):
             logger.info(f"Magic login link sent to {email}")
-            return (
-                "Email Sent..!",
-                "A magic login link has been sent to your email. Please click on the link from the same device.",
-                False,
-                "blue",
-                True,
-                dmc.Loader(size="sm", color="blue"),
-                False,
-                60,
-            )
-
-        logger.error(f"Error sending magic login email to {email}")
-        return _generate_error_response("An error occurred. Please try again later.")
-
+        else:
+            logger.error(f"Error sending magic login email to {email}")
     except Exception as e:
-        logger.error(f"Login error: {e}")
-        return _generate_error_response("An error occurred. Please try again later.")
+        logger.error(f"Error sending magic login email to {email}: {e}")
+
+
+# Outputs of send_magic_link after the alert title and message on errors
+_ERROR_RESPONSE_TAIL = (
+    False,
+    "red",
+    False,
+    dash.no_update,
+    dash.no_update,
+    dash.no_update,
+    dash.no_update,
+)
 
 
 def _generate_error_response(message: str) -> tuple:
     """
     Generates a standard error response tuple for Dash callbacks.
     """
-    return (
-        "Error..!",
-        message,
-        False,
-        "red",
-        False,
-        dash.no_update,
-        dash.no_update,
-        dash.no_update,
-    )
-
-
-# Note (KG): this is the best idea I could think to implement this. Feel free to optimize it.
-
-# This clientside callback polls the local storage for the `hercules_logged_in` flag to
-# check if the user is logged in.
-# The flag is set in the magic_login.py file if the user is logged in successfully.
-
-# 1. If logged in, it redirects the user to the "/overview" page and resets the flag.
-# 2. Disables the polling mechanism after 10 minutes (600 intervals)
-#       to prevent unnecessary requests.
+    return ("Error..!", message) + _ERROR_RESPONSE_TAIL
+
+
+# This clientside callback runs on the `poll_auth` interval once a magic link was sent.
+# The magic link logs the user in from another tab (magic_login.py), which this tab
+# notices in two ways, without polling:
+# - magic_login.py posts on the `hercules_auth` BroadcastChannel, which redirects at once.
+# - When this tab gets the focus back, it asks `/whoami` (see auth.init_login_manager)
+#   whether the session is logged in, e.g. in browsers without BroadcastChannel.
+
+# 1. If logged in, it redirects the user to the "/overview" page (by reloading).
+# 2. Disables the interval 10 minutes after the last email was sent.
 # 3. Manages the countdown timer for the "Resend Email" button:
 #    - If the countdown is active (`email_sent_flag > 0`),
-#       it updates the button text to show the remaining time.
+#       it updates the button text to show the remaining time (ticking every second).
 #    - Once the countdown ends, it enables the "Resend Email" button.
+# 4. After the countdown, the interval only waits for the 10 minutes (ticking every
+#       10 seconds) and ticks that change nothing don't update any component.
 # - n_intervals (int): The number of intervals elapsed since the polling started.
 # - email_sent_flag (int): The countdown timer value for the "Resend Email" button
 #    - set to 60 when the button is initially clicked.
@@ -302,25 +393,59 @@ def _generate_error_response(message: str) -> tuple:
 clientside_callback(
     """
     function(n_intervals, email_sent_flag) {
-        console.log("Polling for auth complete");
-        console.log("n_intervals:", n_intervals);
-        // If user is logged in, redirect
-        if (localStorage.getItem("hercules_logged_in") === '1') {
-            localStorage.removeItem("hercules_logged_in");
-            window.location.href = window.location.href;
-            return [true, dash_clientside.no_update, 
-                dash_clientside.no_update, dash_clientside.no_update];
+        const no_update = dash_clientside.no_update;
+        if (!window.herculesAuthListeners) {
+            window.herculesAuthListeners = true;
+            const redirect = () => {
+                window.location.href = window.location.href;
+            };
+            // Redirect as soon as the magic login tab reports success
+            if (window.BroadcastChannel) {
+                window.herculesAuthChannel = new BroadcastChannel("hercules_auth");
+                window.herculesAuthChannel.onmessage = redirect;
+            }
+            // Otherwise check the session when the user comes back to this tab
+            // (only the 204 of /whoami counts, not e.g. a login page after a redirect)
+            window.addEventListener("focus", () => {
+                fetch("/whoami", {
+                    credentials: "same-origin",
+                    redirect: "manual",
+                    cache: "no-store",
+                }).then((response) => {
+                    if (response.status === 204) {
+                        redirect();
+                    }
+                });
+            });
         }
-        if (n_intervals >= 600) {
+        // (Re)start the 10 minutes when an email was just sent
+        // (send_magic_link sets poll_auth back to one tick per second)
+        if (email_sent_flag >= 60 || !window.herculesAuthPoll) {
+            window.herculesAuthPoll = {start: Date.now(), idle: 0, interval: 1000};
+        }
+        const poll = window.herculesAuthPoll;
+        const setPollInterval = (interval) => {
+            if (poll.interval !== interval) {
+                poll.interval = interval;
+                dash_clientside.set_props("poll_auth", {interval: interval});
+            }
+        };
+        if (Date.now() - poll.start >= 10 * 60 * 1000) {
             // Disable the timer after 10 minutes
             return [true, true, "Reload Page", email_sent_flag];
         }
         // Countdown logic
         if (email_sent_flag > 0) {
-            // Enable button at start and after countdown
+            // During countdown, disable button and show timer (one tick per second)
+            setPollInterval(1000);
             return [false, true, `Resend Email in ${email_sent_flag} seconds`, email_sent_flag - 1];
         }
-        // During countdown, disable button and show timer
+        // Enable button after countdown, then only wait for the 10 minutes
+        poll.idle += 1;
+        setPollInterval(10000);
+        if (poll.idle > 1) {
+            return [no_update, no_update, no_update, no_update];
+        }
         return [false, false, "Resend Email", 0];
     }
     """,
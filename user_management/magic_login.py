@@ -9,24 +9,27 @@ This module provides the layout and callback functions for the magic login funct
 - `reset_success_modal`: A modal displayed upon successful login.
 - `validate_magic_link`: Validates the magic login token from the URL query string,
     handles user authentication, and redirects to the home page upon success.
-- `clientside_callback`: Clears the local storage and closes the window after a successful login.
+- `clientside_callback`: Notifies the login tab and closes the window after a successful login.
 """
 
 from datetime import datetime
+from urllib.parse import parse_qs
 import dash
+import pandas as pd
 from dash import callback, Output, Input, dcc, clientside_callback
 from dash.exceptions import PreventUpdate
 import dash_mantine_components as dmc
 from dash_iconify import DashIconify
 from flask import session
 from flask_login import login_user
-from ..user_management.auth import User
+from ..user_management.auth import User, get_pg, hash_token
 from utils.logger_config import logger
-from shared_code.connections.pg_service import PostgresService
 import os
 
 environment = os.getenv("ENVIRONMENT", "dev")
-pg = PostgresService(schema="chemwatch")
+
+# Length of the magic link tokens (secrets.token_urlsafe(32), see login.send_magic_link)
+TOKEN_LENGTH = 43
 
 
 magic_login_layout = dmc.Center(
@@ -95,24 +98,25 @@ def validate_magic_link(pathname: str, search: str) -> tuple:
         raise PreventUpdate
 
     # Extract token from query string
-    token = search.split("token=")[1] if "token=" in search else None
-    if not token:
+    token = parse_qs((search or "").lstrip("?")).get("token", [None])[0]
+    if not token or len(token) != TOKEN_LENGTH:
         logger.error("No token found in the URL.")
         return _generate_error_response("Invalid or expired magic link.")
 
-    # Validate token
+    # Validate token (stored hashed) and fetch its user in the same query
+    token = hash_token(token)
     now = datetime.now()
     query = """
-        SELECT email FROM hercules_login_magic_link
-        WHERE token = :token AND expiry > :now
+        SELECT u.user_id, u.name, u.email, u.is_admin, u.is_approved
+        FROM hercules_login_magic_link AS l
+        LEFT JOIN hercules_users AS u ON u.email = l.email
+        WHERE l.token = :token AND l.expiry > :now
     """
-    result = pg.do_read(query, {"token": token, "now": now})["data"]
+    result = get_pg().do_read(query, {"token": token, "now": now})["data"]
     if result.empty:
         logger.error("Token validation failed or token expired.")
         return _generate_error_response("Invalid or expired magic link.")
 
-    email = result.iloc[0]["email"]
-
     # Invalidate the token
     if not _invalidate_token(token, now):
         return _generate_error_response(
@@ -120,7 +124,22 @@ def validate_magic_link(pathname: str, search: str) -> tuple:
         )
 
     # Authenticate user
-    return _authenticate_user(email)
+    return _authenticate_user(result.iloc[0])
+
+
+# Back-to-login button shown below every error message (static, built once)
+_BACK_TO_LOGIN_BUTTON = dmc.Anchor(
+    dmc.Button(
+        "Back to Login",
+        id="back_to_login_button_register",
+        variant="outline",
+        rightSection=DashIconify(icon="mdi:login", color="#4267b2"),
+        className="submit_button",
+        mt=10,
+        fullWidth=True,
+    ),
+    href="/login",
+)
 
 
 def _generate_error_response(message: str) -> tuple:
@@ -130,18 +149,7 @@ def _generate_error_response(message: str) -> tuple:
     return (
         [
             dmc.Text(message, c="red", className="lead", mt=50),
-            dmc.Anchor(
-                dmc.Button(
-                    "Back to Login",
-                    id="back_to_login_button_register",
-                    variant="outline",
-                    rightSection=DashIconify(icon="mdi:login", color="#4267b2"),
-                    className="submit_button",
-                    mt=10,
-                    fullWidth=True,
-                ),
-                href="/login",
-            ),
+            _BACK_TO_LOGIN_BUTTON,
         ],
         dash.no_update,
         dash.no_update,
@@ -150,32 +158,30 @@ def _generate_error_response(message: str) -> tuple:
 
 def _invalidate_token(token: str, now: datetime) -> bool:
     """
-    Invalidates the magic link token by setting its expiry to the current time.
+    Invalidates the magic link token (hashed) by setting its expiry to the current time.
     """
     update_query = """
         UPDATE hercules_login_magic_link
         SET expiry = :now
         WHERE token = :token
     """
-    result = pg.do_update(update_query, {"now": now, "token": token})
+    result = get_pg().do_update(update_query, {"now": now, "token": token})
     if not result["success"]:
         logger.error("Failed to invalidate the token.")
         return False
     return True
 
 
-def _authenticate_user(email: str) -> tuple:
+def _authenticate_user(user_record: pd.Series) -> tuple:
     """
-    Authenticates the user based on the provided email and logs them in.
+    Authenticates the user of the magic link and logs them in.
+    The user columns are all missing if the link's email is not registered.
     """
-    user_query = "SELECT * FROM hercules_users WHERE email = :email"
-    user_data = pg.do_read(user_query, {"email": email})["data"]
-    if user_data.empty:
+    if pd.isna(user_record["user_id"]):
         return _generate_error_response(
             "An error occurred while logging in. Please try again later."
         )
 
-    user_record = user_data.iloc[0]
     if not user_record["is_approved"]:
         return _generate_error_response(
             "Your account is not approved yet. Please contact the admin."
@@ -190,7 +196,7 @@ def _authenticate_user(email: str) -> tuple:
     )
     login_user(user)
     session.permanent = True
-    logger.info(f"User {email} logged in via magic link.")
+    logger.info(f"User {user_record['email']} logged in via magic link.")
     return (
         [
             dmc.Text(
@@ -208,7 +214,12 @@ clientside_callback(
     """
     function(data) {
         if (data && data.login_success) {
-            localStorage.setItem('hercules_logged_in', '1');
+            // Tell the login tab (see login.py), which otherwise checks on focus
+            if (window.BroadcastChannel) {
+                const channel = new BroadcastChannel('hercules_auth');
+                channel.postMessage({login_success: true});
+                channel.close();
+            }
             window.close();
         }
         return null;
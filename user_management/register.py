@@ -16,7 +16,10 @@ Callbacks:
                     Redirects the user to the login page after a specified interval.
 """
 
+import functools
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 import dash_mantine_components as dmc
@@ -30,11 +33,24 @@ from utils.email_templates import (
     new_registration_confirmation_template,
 )
 from layout_functions.email_automation import send_email
-from shared_code.connections.pg_service import PostgresService
+from ..user_management.auth import get_pg
 import os
 
 environment = os.getenv("ENVIRONMENT", "dev")
-pg = PostgresService(schema="chemwatch")
+
+# Input formats (compiled once, the validators run on every input change)
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@allianz\.(?:com|de)")
+EMAIL_DOMAINS = ("@allianz.com", "@allianz.de")
+NAME_RE = re.compile(r"[a-zA-ZäöüÄÖÜß\s\-']+")
+
+# The confirmation and the admin alert are sent in the background, so a sign-up
+# only waits for the database insert
+mail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="register_mail")
+
+# Admins rarely change, so the registration alert recipients are kept for a short time
+# (expiry from time.monotonic(), admin emails)
+ADMIN_CACHE_TTL = 60  # in seconds
+_admin_cache: tuple[float, list[str]] | None = None
 
 register_layout = dmc.Center(
     [
@@ -148,12 +164,25 @@ def validate_email(email: str) -> str | bool:
     Returns:
     - str | bool: An error message if the email format is invalid, otherwise False.
     """
+    return _validate_email_str(email)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_email_str(email: str) -> str | bool:
+    """
+    Checks the email format (cached, re-validating an unchanged value is a lookup).
+
+    Parameters:
+    - email (str): The email entered by the user.
 
+    Returns:
+    - str | bool: An error message if the email format is invalid, otherwise False.
+    """
     if not email:
         return "Email cannot be empty."
 
-    email_regex = r"^[a-zA-Z0-9_.+-]+@allianz\.(com|de)$"
-    if re.match(email_regex, email):
+    # Cheap domain check first, the regex only runs for plausible addresses
+    if email.endswith(EMAIL_DOMAINS) and EMAIL_RE.fullmatch(email):
         return False
     return "Invalid email format. Please enter a valid Allianz email \
         (e.g., @allianz.com or @allianz.de)."
@@ -174,11 +203,23 @@ def validate_name(name: str) -> str | bool:
     Returns:
     - str | bool: A message indicating whether the email is valid or not.
     """
+    return _validate_name_str(name)
+
 
+@functools.lru_cache(maxsize=1024)
+def _validate_name_str(name: str) -> str | bool:
+    """
+    Checks the name format (cached, re-validating an unchanged value is a lookup).
+
+    Parameters:
+    - name (str): The name entered by the user.
+
+    Returns:
+    - str | bool: An error message if the name format is invalid, otherwise False.
+    """
     if not name:
         return "Name cannot be empty."
-    name_regex = r"^[a-zA-ZäöüÄÖÜß\s\-']+$"
-    if re.match(name_regex, name):
+    if NAME_RE.fullmatch(name):
         return False
     return "Invalid name format. Please enter a valid name."
 
@@ -195,12 +236,16 @@ def is_duplicate_email(email: str) -> bool | int:
             - -1 if an error occurs during the database query.
     """
 
-    email_check_query = "SELECT COUNT(*) FROM hercules_users WHERE email = :email"
+    # Stops at the first match (hercules_users.email is expected to be unique/indexed)
+    email_check_query = """
+        SELECT EXISTS(SELECT 1 FROM hercules_users WHERE email = :email) AS email_exists
+    """
     email_check_params = {"email": email}
 
     try:
-        email_check_result = pg.do_read(email_check_query, email_check_params)["data"]
-        if not email_check_result.empty and email_check_result.iloc[0]["count"] > 0:
+        result = get_pg().do_read(email_check_query, email_check_params)
+        email_check_result = result["data"]
+        if not email_check_result.empty and email_check_result.iloc[0]["email_exists"]:
             return True
     except Exception as e:
         logger.error(f"Error checking existing email: {e}")
@@ -279,18 +324,21 @@ def register_user(
         "is_admin": False,
     }
 
-    result = pg.do_insert(query, params)
+    result = get_pg().do_insert(query, params)
 
     if result["success"]:
         logger.info(f"User {email} registered successfully.")
 
+        # Both emails carry the same copyright year
+        year = datetime.now().year
+
         # User email
         email_message_user = new_registration_confirmation_template.format(
             name=name,
-            year=datetime.now().year,
+            year=year,
         )
-        user_email_flag = send_email(
-            from_list="tmu-hercules-risk-monitoring@agcs.allianz.com",
+        mail_executor.submit(
+            _send_registration_email,
             to_list=email,
             mail_subject="Hercules Registration Confirmation",
             mail_body=email_message_user,
@@ -305,39 +353,92 @@ def register_user(
             name=name,
             reason=reason,
             admin_panel_link=admin_panel_link,
-            year=datetime.now().year,
-        )
-
-        query = """
-            SELECT email FROM hercules_users WHERE is_admin = True
-        """
-        admin_emails = pg.do_read(query)["data"]
-        if admin_emails.empty:
-            logger.error("No admin emails found for sending registration alert.")
-            return _generate_error_response(
-                "An error occurred during registration. Please try again later."
-            )
-        admin_email_list = ", ".join(admin_emails["email"].tolist())
-
-        admin_email_flag = send_email(
-            from_list="tmu-hercules-risk-monitoring@agcs.allianz.com",
-            to_list=admin_email_list,
-            mail_subject="New User Registration on Hercules",
-            mail_body=email_message_admin,
+            year=year,
         )
-        if user_email_flag and admin_email_flag:
-            logger.info(f"New registration email sent to {email} and admins")
-            return "", True, True, False, True
 
-        logger.error(f"Error sending new registration email to {email}")
+        mail_executor.submit(_send_admin_alert, email_message_admin)
         return "", True, True, False, True
 
-    logger.error(f"Registration error: {result["message"]}")
+    logger.error(f"Registration error: {result['message']}")
     return _generate_error_response(
         "An error occurred during registration. Please try again later."
     )
 
 
+def _send_registration_email(
+    to_list: str, mail_subject: str, mail_body: str, **kwargs: Any
+) -> None:
+    """
+    Sends a registration email (runs on mail_executor, so failures are only logged).
+
+    Parameters:
+    - to_list (str): The recipient address(es).
+    - mail_subject (str): The email subject.
+    - mail_body (str): The rendered email body.
+    - **kwargs: Further send_email arguments (e.g. logo_path).
+    """
+    try:
+        if send_email(
+            from_list="tmu-hercules-risk-monitoring@agcs.allianz.com",
+            to_list=to_list,
+            mail_subject=mail_subject,
+            mail_body=mail_body,
+            **kwargs,
+        ):
+            logger.info(f"Registration email sent to {to_list}")
+        else:
+            logger.error(f"Error sending registration email to {to_list}")
+    except Exception as e:
+        logger.error(f"Error sending registration email to {to_list}: {e}")
+
+
+def _send_admin_alert(email_message_admin: str) -> None:
+    """
+    Sends the new registration alert to all admins (runs on mail_executor, so a
+    failed admin lookup is only logged).
+
+    Parameters:
+    - email_message_admin (str): The rendered alert email body.
+    """
+    try:
+        admin_emails = _get_admin_emails()
+    except Exception as e:
+        logger.error(f"Error fetching admin emails for registration alert: {e}")
+        return
+    if not admin_emails:
+        logger.error("No admin emails found for sending registration alert.")
+        return
+
+    _send_registration_email(
+        to_list=", ".join(admin_emails),
+        mail_subject="New User Registration on Hercules",
+        mail_body=email_message_admin,
+    )
+
+
+def _get_admin_emails() -> list[str]:
+    """
+    Returns the email addresses of all admins, cached for ADMIN_CACHE_TTL seconds.
+
+    Returns:
+    - list[str]: The admin email addresses (empty if none were found).
+    """
+    global _admin_cache
+
+    if _admin_cache and _admin_cache[0] > time.monotonic():
+        return _admin_cache[1]
+
+    query = """
+        SELECT email FROM hercules_users WHERE is_admin = True
+    """
+    admin_emails = get_pg().do_read(query)["data"]
+    if admin_emails.empty:
+        return []
+
+    _admin_cache = (time.monotonic() + ADMIN_CACHE_TTL, admin_emails["email"].tolist())
+    return _admin_cache[1]
+
+
 def _generate_error_response(message: str) -> tuple[str, bool, Any, Any, Any]:
     """
     Generates an error response for the registration process.
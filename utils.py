@@ -1,15 +1,23 @@
+import functools
+import logging
+
 from dash import callback_context
 
+logger = logging.getLogger(__name__)
+
 def log_callback_trigger(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Get the name of the function
         function_name = func.__name__
 
-        # Get the triggered context
-        triggered = callback_context.triggered
-
-        # Print the log message
-        print(f"The function {function_name} was triggered by {triggered}")
+        # Log the triggered context (only looked up when debug logging is enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "The function %s was triggered by %s",
+                function_name,
+                callback_context.triggered,
+            )
 
         # Call the original function
         return func(*args, **kwargs)